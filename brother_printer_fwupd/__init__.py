@@ -2,10 +2,19 @@
 
 import importlib.metadata as importlib_metadata
 
-try:
-    __version__ = importlib_metadata.version(__name__)
-except importlib_metadata.PackageNotFoundError:
-    __version__ = "unknown"
+ISSUE_URL = "https://github.com/sedrubal/brother_printer_fwupd/issues/new"
 
 
-ISSUE_URL = "https://github.com/sedrubal/brother_printer_fwupd/issues/new"
+def __getattr__(name: str) -> str:
+    """Look up ``__version__`` lazily, as reading the package metadata is slow."""
+    if name == "__version__":
+        try:
+            version = importlib_metadata.version(__name__)
+        except importlib_metadata.PackageNotFoundError:
+            version = "unknown"
+
+        globals()["__version__"] = version
+
+        return version
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
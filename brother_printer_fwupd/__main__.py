@@ -12,11 +12,11 @@ import termcolor
 
 from . import ISSUE_URL
 from .common import common_args, printer_info_args
-from .firmware_downloader import fw_downloader_args, get_info_and_download_fw
+from .firmware_downloader import fw_downloader_args, get_info_and_download_fw, prefetch_dns
 from .firmware_uploader import fw_uploader_args, upload_fw
 from .models import SNMPPrinterInfo
 from .snmp_info import get_snmp_info_sync, snmp_args
-from .utils import CONSOLE_LOG_HANDLER, LOGGER, GitHubIssueReporter
+from .utils import CONSOLE_LOG_HANDLER, LOGGER, GitHubIssueReporter, get_running_os
 
 try:
     from .autodiscovery import PrinterDiscoverer
@@ -32,7 +32,7 @@ if typing.TYPE_CHECKING:
 def main():
     """Run the program."""
 
-    def handler_cb(report_url: str):
+    def handler_cb(get_report_url: typing.Callable[[], str]):
         LOGGER.error("This might be a bug.")
 
         while True:
@@ -47,7 +47,7 @@ def main():
             )
 
             if ret.lower() == "y":
-                webbrowser.open(report_url)
+                webbrowser.open(get_report_url())
 
                 return
             elif ret.lower() == "n" or not ret:
@@ -70,13 +70,18 @@ def run(issue_reporter: GitHubIssueReporter):
     """Do a firmware upgrade."""
     args = parse_args()
 
+    if not args.os:
+        args.os = get_running_os()
+
     issue_reporter.set_context_data("--community", args.community)
     issue_reporter.set_context_data("--fw-dir", str(args.fw_dir))
+    issue_reporter.set_context_data("--no-cache", not args.use_cache)
     issue_reporter.set_context_data("--os", args.os)
     issue_reporter.set_context_data("--download-only", args.download_only)
     issue_reporter.set_context_data("--debug", args.debug)
 
     CONSOLE_LOG_HANDLER.setLevel(logging.DEBUG if args.debug else logging.INFO)
+    prefetch_dns()
 
     printer_ip: "typing.Optional[IPAddress]" = args.ip
     upload_port: typing.Optional[int] = args.pdl_ds_port
@@ -140,6 +145,7 @@ def run(issue_reporter: GitHubIssueReporter):
             fw_part=fw_part,
             os=args.os,
             fw_dir=args.fw_dir,
+            use_cache=args.use_cache,
         )
 
         if not fw_file_path:
@@ -4,13 +4,17 @@
 # pylint: disable=R1723
 
 import argparse
+import asyncio
 import ipaddress
+import itertools
 import logging
+import threading
 import typing
 from typing import Optional
 
 import termcolor
 import zeroconf
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncZeroconf
 
 from .common import common_args
 from .models import MDNSPrinterInfo
@@ -18,23 +22,77 @@ from .utils import CONSOLE_LOG_HANDLER, LOGGER, clear_screen
 
 ZEROCONF_SERVICE_DOMAIN = "_pdl-datastream._tcp.local."
 
+#: Timeout for resolving the info of a service in milliseconds
+SERVICE_INFO_TIMEOUT = 3000
+
+#: Delay in seconds, in which changes are collected before the screen is redrawn
+SCREEN_UPDATE_DELAY = 0.1
+
 termcolor.ATTRIBUTES["italic"] = 3  # type: ignore
 
+# Format strings for the styles used for each printer on the selection screen. They are rendered
+# only once (respecting NO_COLOR etc.), so that redrawing the screen is plain string formatting.
+_STYLE_NUM = termcolor.colored("{}", color="blue", attrs=["bold"])
+_STYLE_IP_ADDR = termcolor.colored("{}", color="yellow")
+_STYLE_PLAIN = termcolor.colored("{}")
+_STYLE_NAME = termcolor.colored("{}", color="white")
+_STYLE_ITALIC = termcolor.colored("{}", attrs=["italic"])
+
+
+async def _async_input() -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+
+    A daemon thread is used instead of the default executor of the event loop, because a thread,
+    which is blocked in `input()` would otherwise prevent the program from exiting on ^C.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def set_result(result: str) -> None:
+        if not future.done():
+            future.set_result(result)
+
+    def set_exception(err: BaseException) -> None:
+        if not future.done():
+            future.set_exception(err)
+
+    def read_line() -> None:
+        try:
+            line = input()
+        except EOFError as err:
+            loop.call_soon_threadsafe(set_exception, err)
+        else:
+            loop.call_soon_threadsafe(set_result, line)
+
+    threading.Thread(target=read_line, daemon=True).start()
+
+    return await future
+
 
 class PrinterDiscoverer(zeroconf.ServiceListener):
     """Discoverer of printers."""
 
     def __init__(self) -> None:
-        self._printers: list[MDNSPrinterInfo] = []
-        self._zc = zeroconf.Zeroconf()
+        #: Printer infos (one per address) by service name
+        self._printers: dict[str, list[MDNSPrinterInfo]] = {}
+        #: The printers in the order, in which they are shown on the screen
+        self._shown_printers: list[MDNSPrinterInfo] = []
+        self._aiozc: Optional[AsyncZeroconf] = None
         self._invalid_answer = False
-        self._browser: Optional[zeroconf.ServiceBrowser] = None
+        self._browser: Optional[AsyncServiceBrowser] = None
+        #: Tasks which resolve service infos by service name
+        self._resolve_tasks: dict[str, asyncio.Task] = {}
+        #: The part of the line on the screen for each printer, which does not depend on the others
+        self._rendered_printers: dict[MDNSPrinterInfo, str] = {}
+        self._screen_update_handle: Optional[asyncio.TimerHandle] = None
 
     def remove_service(self, zc: zeroconf.Zeroconf, type_: str, name: str):
         """Called when a service disappears."""
         LOGGER.debug("Service %s removed", name)
+        self._cancel_resolve_task(name)
         self._remove_printer_infos_by_name(name)
-        self._update_screen()
+        self._schedule_screen_update()
 
     @staticmethod
     def _zc_info_to_mdns_printer_infos(
@@ -42,6 +100,16 @@ class PrinterDiscoverer(zeroconf.ServiceListener):
         name: str,
     ) -> typing.Iterator[MDNSPrinterInfo]:
         """Convert the info from zeroconf into MDNSPrinterInfo instances."""
+        # The TXT record is the same for all addresses. Only decode the properties which are used,
+        # as other properties may contain binary data.
+        properties = service_info.properties
+
+        def decode_property(key: bytes) -> typing.Optional[str]:
+            value = properties.get(key)
+
+            return value.decode("utf8") if value else None
+
+        product, note, uuid = (decode_property(key) for key in (b"product", b"note", b"UUID"))
 
         for addr in service_info.addresses:
             try:
@@ -51,27 +119,6 @@ class PrinterDiscoverer(zeroconf.ServiceListener):
 
                 return
 
-            product_raw = service_info.properties.get(b"product", None)
-
-            if product_raw:
-                product = product_raw.decode("utf8")
-            else:
-                product = None
-
-            note_raw = service_info.properties.get(b"note", None)
-
-            if note_raw:
-                note = note_raw.decode("utf8")
-            else:
-                note = None
-
-            uuid_raw = service_info.properties.get(b"UUID", None)
-
-            if uuid_raw:
-                uuid = uuid_raw.decode("utf8")
-            else:
-                uuid = None
-
             yield MDNSPrinterInfo(
                 ip_addr=ip_addr,
                 name=name,
@@ -83,14 +130,16 @@ class PrinterDiscoverer(zeroconf.ServiceListener):
 
     def _remove_printer_infos_by_name(self, name: str):
         """Remove all known printer infos by their name."""
-        printers_to_remove = [p for p in self._printers if p.name == name]
-
-        for printer in printers_to_remove:
-            self._printers.remove(printer)
-
-    def _add_printer_infos(self, zc: zeroconf.Zeroconf, type_: str, name: str):
-        """Add printer info."""
-        service_info = zc.get_service_info(type_, name)
+        for printer in self._printers.pop(name, ()):
+            self._rendered_printers.pop(printer, None)
+
+    async def _add_printer_infos(self, type_: str, name: str):
+        """Resolve the service info and add (or replace) the printer infos of the service."""
+        assert self._aiozc
+        service_info = await self._aiozc.async_get_service_info(
+            type_, name, timeout=SERVICE_INFO_TIMEOUT
+        )
+        self._remove_printer_infos_by_name(name)
 
         if not service_info:
             LOGGER.error(
@@ -101,24 +150,87 @@ class PrinterDiscoverer(zeroconf.ServiceListener):
 
             return
 
-        for printer_info in PrinterDiscoverer._zc_info_to_mdns_printer_infos(service_info, name):
-            self._printers.append(printer_info)
+        self._printers[name] = list(
+            PrinterDiscoverer._zc_info_to_mdns_printer_infos(service_info, name)
+        )
 
-        self._update_screen()
+        for printer_info in self._printers[name]:
+            self._rendered_printers[printer_info] = PrinterDiscoverer._render_printer_info(
+                printer_info
+            )
+
+        self._schedule_screen_update()
+
+    def _cancel_resolve_task(self, name: str):
+        """Cancel resolving the service info of a service, if it is still in progress."""
+        task = self._resolve_tasks.pop(name, None)
+
+        if task:
+            task.cancel()
+
+    def _resolve_service(self, type_: str, name: str):
+        """
+        Resolve the service info in a task.
+
+        This way, the infos of many services can be resolved concurrently.
+        """
+        self._cancel_resolve_task(name)
+        task = asyncio.ensure_future(self._add_printer_infos(type_, name))
+        self._resolve_tasks[name] = task
+
+        def on_done(_task: asyncio.Task) -> None:
+            if self._resolve_tasks.get(name) is task:
+                del self._resolve_tasks[name]
+
+        task.add_done_callback(on_done)
 
     def add_service(self, zc: zeroconf.Zeroconf, type_: str, name: str):
         """Called, when a new service appears."""
         LOGGER.debug("Service %s added", name)
-        self._add_printer_infos(zc, type_, name)
+        self._resolve_service(type_, name)
 
     def update_service(self, zc: zeroconf.Zeroconf, type_: str, name: str):
         """Update a service."""
-        LOGGER.debug("Service {name} updated")
-        self._remove_printer_infos_by_name(name)
-        self._add_printer_infos(zc, type_, name)
+        LOGGER.debug("Service %s updated", name)
+        self._resolve_service(type_, name)
+
+    @staticmethod
+    def _render_printer_info(info: MDNSPrinterInfo) -> str:
+        """Render the printer info for the selection screen (without number and IP address)."""
+        port_str = _STYLE_PLAIN.format(f"Port {info.port}")
+        name_str = _STYLE_NAME.format(info.name)
+        product_str = _STYLE_PLAIN.format(f"- Product: {info.product}") if info.product else ""
+        note_str = _STYLE_ITALIC.format(f"- Note: {info.note}") if info.note else ""
+        uuid_str = _STYLE_ITALIC.format(f"- UUID: {info.uuid}") if info.uuid else ""
+
+        return " ".join((port_str, name_str, product_str, note_str, uuid_str))
+
+    def _schedule_screen_update(self):
+        """
+        Update the screen soon.
+
+        MDNS answers often arrive in bursts. This way, the screen is redrawn only once per burst.
+        """
+        if self._screen_update_handle:
+            return
+
+        def update_screen() -> None:
+            self._screen_update_handle = None
+            self._update_screen()
+
+        self._screen_update_handle = asyncio.get_running_loop().call_later(
+            SCREEN_UPDATE_DELAY, update_screen
+        )
+
+    def _cancel_screen_update(self):
+        """Cancel a scheduled update of the screen."""
+        if self._screen_update_handle:
+            self._screen_update_handle.cancel()
+            self._screen_update_handle = None
 
     def _update_screen(self):
         """Update the CLI printer selection screen."""
+        self._cancel_screen_update()
         clear_screen()
 
         termcolor.cprint("Choose a printer", attrs=["bold"], end=" ")
@@ -128,44 +240,21 @@ class PrinterDiscoverer(zeroconf.ServiceListener):
             LOGGER.error("Invalid answer.")
         print()
 
-        if self._printers:
-            max_str_len = len(str(len(self._printers) - 1))
-            max_ip_len = max(len(str(info.ip_addr)) for info in self._printers)
-
-            for i, info in enumerate(self._printers):
-                num_str = termcolor.colored(
-                    f"[{str(i).rjust(max_str_len)}]", color="blue", attrs=["bold"]
-                )
-                ip_addr_str = termcolor.colored(str(info.ip_addr).rjust(max_ip_len), color="yellow")
-                port_str = termcolor.colored(f"Port {info.port}")
-                name_str = termcolor.colored(info.name, color="white")
-                product_str = (
-                    termcolor.colored(f"- Product: {info.product}") if info.product else ""
-                )
-                note_str = (
-                    termcolor.colored(f"- Note: {info.note}", attrs=["italic"]) if info.note else ""
-                )
-                uuid_str = (
-                    termcolor.colored(f"- UUID: {info.uuid}", attrs=["italic"]) if info.uuid else ""
-                )
-                print(
-                    " ".join(
-                        (
-                            num_str,
-                            ip_addr_str,
-                            port_str,
-                            name_str,
-                            product_str,
-                            note_str,
-                            uuid_str,
-                        )
-                    )
-                )
+        self._shown_printers = list(itertools.chain.from_iterable(self._printers.values()))
+
+        if self._shown_printers:
+            max_str_len = len(str(len(self._shown_printers) - 1))
+            max_ip_len = max(len(str(info.ip_addr)) for info in self._shown_printers)
+
+            for i, info in enumerate(self._shown_printers):
+                num_str = _STYLE_NUM.format(f"[{str(i).rjust(max_str_len)}]")
+                ip_addr_str = _STYLE_IP_ADDR.format(str(info.ip_addr).rjust(max_ip_len))
+                print(num_str, ip_addr_str, self._rendered_printers[info])
 
             print()
 
-            if len(self._printers) > 1:
-                range_str = f"[0 - {len(self._printers) - 1}; Enter: Cancel]"
+            if len(self._shown_printers) > 1:
+                range_str = f"[0 - {len(self._shown_printers) - 1}; Enter: Cancel]"
             else:
                 range_str = "[0 / Enter: Use first entry; ^C: Cancel]"
 
@@ -185,43 +274,62 @@ class PrinterDiscoverer(zeroconf.ServiceListener):
 
     def run_cli(self) -> Optional[MDNSPrinterInfo]:
         """Run as interactive terminal application."""
+        try:
+            return asyncio.run(self._run_cli())
+        except KeyboardInterrupt:
+            print()
+            return None
+        finally:
+            clear_screen()
+
+    async def _run_cli(self) -> Optional[MDNSPrinterInfo]:
+        """Run the interactive terminal application in the event loop."""
         self._run()
         self._update_screen()
 
         try:
             while True:
-                inpt = input()
+                inpt = await _async_input()
 
                 if not inpt.strip():
                     # Enter
-                    if len(self._printers) == 1:
-                        return self._printers[0]
+                    if len(self._shown_printers) == 1:
+                        return self._shown_printers[0]
                     else:
                         return None
 
                 try:
-                    return self._printers[int(inpt)]
+                    return self._shown_printers[int(inpt)]
                 except (ValueError, IndexError):
                     self._invalid_answer = True
                     self._update_screen()
-        except (KeyboardInterrupt, EOFError):
+        except EOFError:
             print()
             return None
         finally:
-            self._stop()
-            clear_screen()
+            await self._stop()
 
     def _run(self):
         """Auto detect printer using zeroconf."""
-        self._browser = zeroconf.ServiceBrowser(
-            zc=self._zc,
+        self._aiozc = AsyncZeroconf()
+        self._browser = AsyncServiceBrowser(
+            zeroconf=self._aiozc.zeroconf,
             type_=ZEROCONF_SERVICE_DOMAIN,
-            handlers=self,
+            listener=self,
         )
 
-    def _stop(self):
+    async def _stop(self):
         """Stop discovering."""
-        self._zc.close()
+        self._cancel_screen_update()
+
+        for name in list(self._resolve_tasks):
+            self._cancel_resolve_task(name)
+
+        if self._browser:
+            await self._browser.async_cancel()
+
+        if self._aiozc:
+            await self._aiozc.async_close()
 
 
 def parse_args() -> argparse.Namespace:
@@ -1,14 +1,42 @@
 """Common helper functions."""
 
 import argparse
+import sys
 
 from .models import FWInfo
 
 
+class _VersionAction(argparse.Action):
+    """Like ``action="version"``, but only look up the version, when it is requested."""
+
+    def __init__(
+        self,
+        option_strings,
+        dest=argparse.SUPPRESS,
+        default=argparse.SUPPRESS,
+        help=None,
+    ):
+        # pylint: disable=redefined-builtin
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from . import __version__  # pylint: disable=import-outside-toplevel,no-name-in-module
+
+        # Like argparse's version action, print to stdout, so that the version can be captured
+        parser._print_message(  # pylint: disable=protected-access
+            f"{parser.prog} {__version__}\n", sys.stdout
+        )
+        parser.exit()
+
+
 def common_args(parser: argparse.ArgumentParser, ip_required: bool):
     """Add common args to a argparse parser."""
-    from . import __version__  # pylint: disable=import-outside-toplevel
-
     if ip_required:
         blurb = "required, because zeroconf is not available"
     else:
@@ -31,8 +59,8 @@ def common_args(parser: argparse.ArgumentParser, ip_required: bool):
     )
     parser.add_argument(
         "--version",
-        action="version",
-        version=f"%(prog)s {__version__}",
+        action=_VersionAction,
+        help="show program's version number and exit",
     )
 
 
@@ -1,13 +1,25 @@
 """Get the firmware download URL and download the firmare from the official Brother website."""
 
 import argparse
+import hashlib
+import json
 import logging
+import mmap
+import socket
+import sys
+import threading
 import typing
-from copy import copy
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from os import environ
 from pathlib import Path
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from . import ISSUE_URL
 from .common import common_args, printer_info_args
@@ -20,24 +32,30 @@ from .utils import (
     sluggify,
 )
 
+try:
+    from os import pwrite
+except ImportError:
+    # Not available on Windows
+    pwrite = None  # type: ignore[assignment]
+
 FW_UPDATE_URL = "https://firmverup.brother.co.jp/kne_bh7_update_nt_ssl/ifax2.asmx/fileUpdate"
 
-API_REQUEST_DATA_TEMPLATE = BeautifulSoup(
-    """
+API_REQUEST_DATA_TEMPLATE = """
+<?xml version="1.0" encoding="utf-8"?>
 <REQUESTINFO>
     <FIRMUPDATETOOLINFO>
-        <FIRMCATEGORY></FIRMCATEGORY>
-        <OS></OS>
+        <FIRMCATEGORY>{firmid}</FIRMCATEGORY>
+        <OS>{os}</OS>
         <INSPECTMODE>1</INSPECTMODE>
     </FIRMUPDATETOOLINFO>
 
     <FIRMUPDATEINFO>
         <MODELINFO>
-            <SERIALNO></SERIALNO>
-            <NAME></NAME>
-            <SPEC></SPEC>
-            <DRIVER></DRIVER>
-            <FIRMINFO></FIRMINFO>
+            <{serial_tag}></{serial_tag}>
+            <NAME>{name}</NAME>
+            <SPEC>{spec}</SPEC>
+            <DRIVER>{driver}</DRIVER>
+            <FIRMINFO>{firminfo}</FIRMINFO>
         </MODELINFO>
         <DRIVERCNT>1</DRIVERCNT>
         <LOGNO>2</LOGNO>
@@ -45,14 +63,84 @@ API_REQUEST_DATA_TEMPLATE = BeautifulSoup(
         <NEEDRESPONSE>1</NEEDRESPONSE>
     </FIRMUPDATEINFO>
 </REQUESTINFO>
-""".strip(),
-    "xml",
-)
+""".strip()
+
+API_REQUEST_FIRM_TEMPLATE = "<FIRM><ID>{firmid}</ID><VERSION>{firmver}</VERSION></FIRM>"
+
+#: Variants of the API request by name, in the order of preference. Each variant overrides some
+#: values in the request data.
+API_REQUEST_VARIANTS: dict[str, dict[str, str]] = {
+    "default": {},
+    # Required for MFC-L3750CDW, HL-L2360DW and others:
+    # Replace `<SERIALNO>` with typo `<SELIALNO>` and add "EWS" to `<DRIVER>`.
+    # See https://github.com/sedrubal/brother_printer_fwupd/issues/19
+    "driver_ews": {"driver": "EWS", "serial_tag": "SELIALNO"},
+}
+
+#: Tags of the API response, which are evaluated
+API_RESPONSE_TAGS = ("VERSIONCHECK", "LATESTVERSION", "FIRMID", "PATH")
 
 REQUESTS_TIMEOUT = 10
 
+#: File, in which the API request variant, which worked for a printer model, is remembered
+VARIANT_CACHE_FILE = (
+    Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "brother_printer_fwupd"
+    / "variants.json"
+)
+
+#: Maximum number of connections used to download a firmware file in parallel
+DOWNLOAD_CONNECTIONS = 4
+
+#: Session for all HTTP requests, which keeps connections alive and retries on temporary errors
+SESSION = requests.Session()
+
+for _prefix in ("https://", "http://"):
+    SESSION.mount(
+        _prefix,
+        HTTPAdapter(
+            # Keep a connection alive for each parallel request to a host: the API request variants
+            # and the byte ranges of a download.
+            pool_maxsize=DOWNLOAD_CONNECTIONS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1.0,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # Requests to the update API only query information, so retrying them is safe.
+                allowed_methods=["HEAD", "GET", "POST"],
+                # Return the last response and let raise_for_status() report it.
+                raise_on_status=False,
+            ),
+        ),
+    )
+
+#: Minimum size of a byte range, that is worth to be downloaded using a separate connection
+MIN_DOWNLOAD_RANGE_SIZE = 1024 * 1024
 
-RUNNING_OS = get_running_os()
+#: Minimum number of bytes to download before the progress is updated
+PROGRESS_MIN_STEP = 1024 * 1024
+
+#: Size of the chunks in which downloads are read and written
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def prefetch_dns() -> None:
+    """
+    Resolve the host name of the update API in the background.
+
+    Call this before doing something else that takes a while (e.g. SNMP). The resolver of the OS
+    (e.g. systemd-resolved, macOS, Windows) caches the answer, so the DNS lookup is not on the
+    critical path later.
+    """
+    url = urlsplit(FW_UPDATE_URL)
+
+    def resolve() -> None:
+        try:
+            socket.getaddrinfo(url.hostname, url.port or 443, 0, socket.SOCK_STREAM)
+        except OSError as err:
+            LOGGER.debug("Could not resolve %s in advance: %s", url.hostname, err)
+
+    threading.Thread(target=resolve, daemon=True).start()
 
 
 def get_download_url(
@@ -66,68 +154,177 @@ def get_download_url(
     :return: Tuple of download latest version and URL.
     """
 
-    api_request_data = copy(API_REQUEST_DATA_TEMPLATE)
-    api_request_data.REQUESTINFO.FIRMUPDATETOOLINFO.FIRMCATEGORY.string = firmid
-    api_request_data.REQUESTINFO.FIRMUPDATETOOLINFO.OS.string = reported_os
-    api_request_data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.NAME.string = printer_info.model
-    api_request_data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.SPEC.string = printer_info.spec
+    api_request_data = {
+        "firmid": escape(firmid),
+        "os": escape(reported_os),
+        "serial_tag": "SERIALNO",
+        "name": escape(printer_info.model or ""),
+        "spec": escape(printer_info.spec or ""),
+        "driver": "",
+        "firminfo": "".join(
+            API_REQUEST_FIRM_TEMPLATE.format(
+                firmid=escape(fw_info.firmid),
+                firmver=escape(fw_info.firmver),
+            )
+            for fw_info in printer_info.fw_versions
+        ),
+    }
 
-    for fw_info in printer_info.fw_versions:
-        firm_info = Tag(name="FIRM", parser="xml")
-        firm_info.append(Tag(name="ID", parser="xml"))
-        firm_info.append(Tag(name="VERSION", parser="xml"))
-        firm_info.ID.string = fw_info.firmid
-        firm_info.VERSION.string = fw_info.firmver
+    errors: list[Exception] = []
+    variants = list(API_REQUEST_VARIANTS)
+    cached_variant = _load_cached_variant(printer_info.model)
 
-        api_request_data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.FIRMINFO.append(firm_info)
+    if cached_variant:
+        # Most likely, the variant which worked last time works again. Only try the others if not.
+        variants.remove(cached_variant)
+        variant_batches = [[cached_variant], variants]
+    else:
+        variant_batches = [variants]
 
-    errors: list[Exception] = []
+    for batch in variant_batches:
+        if not batch:
+            continue
 
-    for modification_callback in (copy, apply_driver_ews, apply_api_misspelling):
-        api_request_data_str = str(modification_callback(api_request_data))
+        result = _request_variants(api_request_data, batch, firmid, errors)
 
-        # curl -X POST -d @hl3040cn-update.xml -H "Content-Type:text/xml"
-        LOGGER.debug(
-            "Sending POST request to %s with following content:\n%s",
-            FW_UPDATE_URL,
-            api_request_data_str,
-        )
-        resp = requests.post(
-            FW_UPDATE_URL,
-            data=api_request_data_str,
-            headers={"Content-Type": "text/xml"},
-            timeout=REQUESTS_TIMEOUT,
-        )
-        resp.raise_for_status()
-        LOGGER.debug("Response:\n%s", resp.text)
+        if result:
+            variant, download_info = result
 
-        try:
-            return parse_response(response=resp.text, firmid=firmid)
-        except ValueError as err:
-            errors.append(err)
-            LOGGER.warning(err)
-            continue
+            if variant != cached_variant:
+                _save_cached_variant(printer_info.model, variant)
+
+            return download_info
 
     raise ExceptionGroupCompat("Giving up fetching firmware.", errors)
 
 
+def _request_variants(
+    api_request_data: dict[str, str],
+    variants: list[str],
+    firmid: str,
+    errors: list[Exception],
+) -> typing.Optional[tuple[str, typing.Union[tuple[str, str], tuple[None, None]]]]:
+    """
+    Send the API request in all given variants at once.
+
+    This way, a rejected variant does not cost an extra round trip. The responses are evaluated in
+    the given order of preference. Errors are appended to `errors`.
+
+    :return: The name of the first accepted variant and the parsed response, or None.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(variants))
+
+    try:
+        futures = {
+            variant: executor.submit(
+                _post_api_request,
+                API_REQUEST_DATA_TEMPLATE.format_map(
+                    {**api_request_data, **API_REQUEST_VARIANTS[variant]}
+                ),
+            )
+            for variant in variants
+        }
+
+        for variant, future in futures.items():
+            response = future.result()
+
+            try:
+                return variant, parse_response(response=response, firmid=firmid)
+            except ValueError as err:
+                errors.append(err)
+                LOGGER.warning(err)
+                continue
+    finally:
+        # Don't wait for responses to less preferred variants that are still in flight.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return None
+
+
+def _read_variant_cache() -> dict[str, str]:
+    """Read the API request variants, which worked before, by printer model."""
+    try:
+        variants = json.loads(VARIANT_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+    return variants if isinstance(variants, dict) else {}
+
+
+def _load_cached_variant(model: typing.Optional[str]) -> typing.Optional[str]:
+    """Get the name of the API request variant, which worked for the printer model before."""
+    if not model:
+        return None
+
+    variant = _read_variant_cache().get(model)
+
+    return variant if variant in API_REQUEST_VARIANTS else None
+
+
+def _save_cached_variant(model: typing.Optional[str], variant: str) -> None:
+    """Remember the API request variant, which worked for the printer model."""
+    if not model:
+        return
+
+    variants = _read_variant_cache()
+    variants[model] = variant
+
+    try:
+        VARIANT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        VARIANT_CACHE_FILE.write_text(json.dumps(variants, indent=4), encoding="utf-8")
+    except OSError as err:
+        LOGGER.debug("Could not remember API request variant in %s: %s", VARIANT_CACHE_FILE, err)
+
+
+def _post_api_request(api_request_data_str: str) -> str:
+    """Send a request to the firmware update API and return the response body."""
+    # curl -X POST -d @hl3040cn-update.xml -H "Content-Type:text/xml"
+    LOGGER.debug(
+        "Sending POST request to %s with following content:\n%s",
+        FW_UPDATE_URL,
+        api_request_data_str,
+    )
+    resp = SESSION.post(
+        FW_UPDATE_URL,
+        data=api_request_data_str.encode("utf-8"),
+        headers={"Content-Type": "text/xml"},
+        timeout=REQUESTS_TIMEOUT,
+    )
+    resp.raise_for_status()
+    # resp.text decodes the body (and guesses its encoding) on every access, so only do it once.
+    response = resp.text
+    LOGGER.debug("Response:\n%s", response)
+
+    return response
+
+
 def parse_response(response: str, firmid: str) -> typing.Union[tuple[str, str], tuple[None, None]]:
     """
     Parse the API response and return a tuple of the latest version and the download URL.
     """
-    resp_xml = BeautifulSoup(response, "xml")
+    try:
+        resp_xml = ET.fromstring(response.encode("utf-8"))
+    except ET.ParseError as err:
+        raise ValueError(f"Invalid response: Could not parse response '{response}': {err}") from err
+
+    # Collect the texts of all relevant tags in a single pass over the tree. Tags are compared
+    # without their namespace.
+    tags: dict[str, list[str]] = {name: [] for name in API_RESPONSE_TAGS}
+
+    for element in resp_xml.iter():
+        if isinstance(element.tag, str):
+            tags.get(element.tag.rpartition("}")[2], []).append(element.text or "")
 
     def select_one(name: str) -> str:
-        tags = resp_xml.select(name)
-        if len(tags) > 1:
+        if len(tags[name]) > 1:
             raise ValueError(
-                f"Invalid response: Expected only one tag of name '{name}' in response '{resp_xml}'."
+                f"Invalid response: Expected only one tag of name '{name}' in response '{response}'."
             )
-        elif len(tags) == 0:
+        elif not tags[name]:
             raise ValueError(
-                f"Invalid response: Expected tag '{name}' to be in response '{resp_xml}'."
+                f"Invalid response: Expected tag '{name}' to be in response '{response}'."
             )
-        return tags[0].text
+        return tags[name][0]
 
     versioncheck_val = select_one("VERSIONCHECK")
     if versioncheck_val == "1":
@@ -150,7 +347,7 @@ def parse_response(response: str, firmid: str) -> typing.Union[tuple[str, str],
         return None, None
     else:
         raise ValueError(
-            f"Unknown value of 'versioncheck' in response for firmid={firmid}: '{resp_xml}'."
+            f"Unknown value of 'versioncheck' in response for firmid={firmid}: '{response}'."
         )
 
     latest_version = select_one("LATESTVERSION")
@@ -167,38 +364,295 @@ def parse_response(response: str, firmid: str) -> typing.Union[tuple[str, str],
     return latest_version, select_one("PATH")
 
 
-def apply_driver_ews(data: BeautifulSoup) -> BeautifulSoup:
+def _parse_content_range_total(content_range: typing.Optional[str]) -> typing.Optional[int]:
     """
-    Modify the request data in the way it is required for MFC-L3750CDW, HL-L2360DW and others.
+    Get the complete length from a `Content-Range` header value.
 
-    1. Remove `<SERIALNO>` / `<SELIALNO>`
-    2. Add "EWS" to `<DRIVER>`
-    See https://github.com/sedrubal/brother_printer_fwupd/issues/19#issuecomment-2079813638
+    E.g. `bytes 100-999/1000` or `bytes */1000` result in `1000`.
+    :return: The complete length or None, if the length is unknown or the header is invalid.
     """
-    LOGGER.info("Trying again without <SERIALNO> in API request but with <DRIVER>EWS</DRIVER>...")
-    data = copy(data)
-    data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.DRIVER.string = "EWS"
-    data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.SERIALNO.replace_with(
-        Tag(name="SELIALNO", parser="xml")
-    )
-    return data
+    if not content_range:
+        return None
+
+    _unit, _sep, range_spec = content_range.strip().partition(" ")
+    _range, sep, complete_length = range_spec.partition("/")
+
+    if not sep or not complete_length.isdigit():
+        return None
 
+    return int(complete_length)
 
-def apply_api_misspelling(data: BeautifulSoup) -> BeautifulSoup:
+
+def _parse_content_range(content_range: typing.Optional[str]) -> typing.Optional[tuple[int, int]]:
     """
-    Another modification which works for MFC-L3750CDW, HL-L2360DW and others.
+    Get the first and last byte position from a `Content-Range` header value.
 
-    1. Replace `<SERIALNO>` with typo `<SELIALNO>`
-    2. Add "EWS" to `<DRIVER>`
-    See https://github.com/sedrubal/brother_printer_fwupd/issues/19
+    E.g. `bytes 100-999/1000` results in `(100, 999)`.
+    :return: The byte positions or None, if the header is invalid or does not contain a range.
     """
-    LOGGER.info("Trying again with misspelling in API request...")
-    data = copy(data)
-    data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.DRIVER.string = "EWS"
-    data.REQUESTINFO.FIRMUPDATEINFO.MODELINFO.SERIALNO.replace_with(
-        Tag(name="SELIALNO", parser="xml")
+    if not content_range:
+        return None
+
+    unit, _sep, range_spec = content_range.strip().partition(" ")
+    byte_range, _sep, _complete_length = range_spec.partition("/")
+    first, sep, last = byte_range.partition("-")
+
+    if unit != "bytes" or not sep or not first.isdigit() or not last.isdigit():
+        return None
+
+    return int(first), int(last)
+
+
+class _DownloadProgress:
+    """Thread safe progress indicator for downloads."""
+
+    def __init__(self, total_size: int, size_done: int = 0):
+        self._total_size = total_size
+        self._size_done = size_done
+        self._lock = threading.Lock()
+        # Don't clutter logs, when the output is not a terminal.
+        self._enabled = bool(total_size) and sys.stdout.isatty()
+        # Print at most once per percent and MiB
+        self._print_step = max(total_size // 100, PROGRESS_MIN_STEP)
+        self._next_print_at = size_done
+
+    def update(self, size: int) -> None:
+        """Add `size` downloaded bytes and print the progress from time to time."""
+        with self._lock:
+            self._size_done += size
+
+            if not self._enabled or (
+                self._size_done < self._next_print_at and self._size_done < self._total_size
+            ):
+                return
+
+            self._next_print_at = self._size_done + self._print_step
+            progress = self._size_done / self._total_size * 100
+            print(f"\r{progress: 5.1f} %", end="", flush=True)
+
+    def finish(self) -> None:
+        """End the line of the progress indicator."""
+        if self._enabled:
+            print()
+
+
+def _iter_body(resp: requests.Response) -> typing.Iterator[memoryview]:
+    """
+    Read the body of a streamed response in chunks of at most `DOWNLOAD_CHUNK_SIZE` bytes.
+
+    All chunks are read into the same buffer, i.e. each chunk is only valid until the next one is
+    requested.
+    """
+    # Like iter_content, but without allocating a new bytes object per chunk.
+    resp.raw.decode_content = True
+    buf = bytearray(DOWNLOAD_CHUNK_SIZE)
+    view = memoryview(buf)
+
+    while True:
+        size = resp.raw.readinto(buf)
+
+        if not size:
+            return
+
+        yield view[:size]
+
+
+def _download_range(
+    url: str,
+    fd: int,
+    first: int,
+    last: int,
+    progress: _DownloadProgress,
+) -> bool:
+    """
+    Download the bytes `first` to `last` (inclusive) and write them to `fd` at the same offset.
+
+    :return: False, if the server ignored the range request or returned a different range.
+    """
+    resp = SESSION.get(
+        url,
+        headers={"Range": f"bytes={first}-{last}"},
+        stream=True,
+        timeout=REQUESTS_TIMEOUT,
     )
-    return data
+    resp.raise_for_status()
+
+    if resp.status_code != HTTPStatus.PARTIAL_CONTENT or _parse_content_range(
+        resp.headers.get("content-range")
+    ) != (first, last):
+        resp.close()
+
+        return False
+
+    offset = first
+
+    for chunk in _iter_body(resp):
+        view = chunk
+
+        while view:
+            size = pwrite(fd, view, offset)
+            view = view[size:]
+            offset += size
+
+        progress.update(len(chunk))
+
+    return True
+
+
+def _download_parallel(head: requests.Response, out_file: Path) -> bool:
+    """
+    Download the file in multiple byte ranges using parallel connections.
+
+    :param head: The response to a HEAD request for the file.
+    :return: False, if the server does not support range requests or the file is too small to
+        benefit from parallel connections. The caller should fall back to a single connection then.
+    """
+    total_size = int(head.headers.get("content-length", 0))
+    connections = min(DOWNLOAD_CONNECTIONS, total_size // MIN_DOWNLOAD_RANGE_SIZE)
+
+    if head.headers.get("accept-ranges") != "bytes" or connections < 2:
+        return False
+
+    LOGGER.debug("Downloading %i bytes using %i connections.", total_size, connections)
+    range_size = -(-total_size // connections)
+    progress = _DownloadProgress(total_size)
+
+    try:
+        with out_file.open("wb") as out:
+            out.truncate(total_size)
+
+            with ThreadPoolExecutor(max_workers=connections) as executor:
+                futures = [
+                    executor.submit(
+                        _download_range,
+                        url=head.url,
+                        fd=out.fileno(),
+                        first=first,
+                        last=min(first + range_size, total_size) - 1,
+                        progress=progress,
+                    )
+                    for first in range(0, total_size, range_size)
+                ]
+                success = all([future.result() for future in futures])
+    except BaseException:
+        # Don't leave a preallocated file behind, which would look like a complete download.
+        out_file.unlink(missing_ok=True)
+        raise
+
+    if not success:
+        LOGGER.debug(
+            "Server ignored or did not honor range request. Falling back to a single connection."
+        )
+        out_file.unlink()
+
+        return False
+
+    progress.finish()
+
+    return True
+
+
+def _download_stream(url: str, out_file: Path, resume_from: int = 0) -> None:
+    """
+    Download the file using a single connection.
+
+    If `resume_from` is not 0, only the missing bytes are requested using a HTTP range request.
+    """
+    headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+
+    resp = SESSION.get(url, headers=headers, stream=True, timeout=REQUESTS_TIMEOUT)
+
+    if resp.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+        resp.close()
+
+        if _parse_content_range_total(resp.headers.get("content-range")) == resume_from:
+            LOGGER.info("Firmware file %s was already downloaded completely.", out_file)
+
+            return
+
+        # The local file does not match the remote file. Start from scratch.
+        LOGGER.warning("Existing file %s seems to be invalid. Downloading again.", out_file)
+        resume_from = 0
+        resp = SESSION.get(url, stream=True, timeout=REQUESTS_TIMEOUT)
+
+    resp.raise_for_status()
+    resuming = bool(resume_from) and resp.status_code == HTTPStatus.PARTIAL_CONTENT
+
+    if resuming:
+        content_range = _parse_content_range(resp.headers.get("content-range"))
+
+        if not content_range or content_range[0] != resume_from:
+            # Appending a different range would corrupt the file. Start from scratch.
+            LOGGER.warning(
+                "Server returned an unexpected range (%s) for %s. Downloading again.",
+                resp.headers.get("content-range"),
+                out_file,
+            )
+            resp.close()
+            resuming = False
+            resp = SESSION.get(url, stream=True, timeout=REQUESTS_TIMEOUT)
+            resp.raise_for_status()
+
+    if resuming:
+        LOGGER.info("Resuming download of %s at byte %i.", out_file, resume_from)
+        mode = "ab"
+        size_written = resume_from
+        total_size = _parse_content_range_total(resp.headers.get("content-range")) or (
+            resume_from + int(resp.headers.get("content-length", 0))
+        )
+    else:
+        # The server ignored the range request (or there was nothing to resume).
+        mode = "wb"
+        size_written = 0
+        total_size = int(resp.headers.get("content-length", 0))
+
+    progress = _DownloadProgress(total_size, size_done=size_written)
+
+    # Unbuffered, as the chunks are large anyway. This saves copying them into the buffer first.
+    with out_file.open(mode, buffering=0) as out:
+        for chunk in _iter_body(resp):
+            view = chunk
+
+            while view:
+                # Unlike BufferedWriter.write, FileIO.write may write only a part of the data.
+                view = view[out.write(view) :]
+
+            progress.update(len(chunk))
+
+    progress.finish()
+
+
+def _sha256sum(path: Path) -> str:
+    """Calculate the SHA-256 hex digest of a file."""
+    checksum = hashlib.sha256()
+
+    with path.open("rb") as file:
+        if path.stat().st_size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                checksum.update(data)
+
+    return checksum.hexdigest()
+
+
+def _is_cached(out_file: Path, checksum_file: Path, total_size: int) -> bool:
+    """
+    Check if `out_file` is a complete download.
+
+    This is the case, if it has the expected size and matches the checksum, which was stored in
+    `checksum_file` (in the format of `sha256sum`) after the download.
+    """
+    if not total_size or out_file.stat().st_size != total_size or not checksum_file.exists():
+        return False
+
+    try:
+        expected_checksum, *_rest = checksum_file.read_text().split(maxsplit=1)
+    except (OSError, UnicodeDecodeError, ValueError):
+        # The checksum file is unreadable, empty or malformed (e.g. writing it was interrupted).
+        LOGGER.debug("Ignoring invalid checksum file %s.", checksum_file)
+
+        return False
+
+    return _sha256sum(out_file) == expected_checksum
 
 
 def download_fw(
@@ -207,23 +661,46 @@ def download_fw(
     printer_model: str,
     fw_part: typing.Union[str, FWInfo],
     latest_version: str,
-):
-    """Download the firmware."""
-    resp = requests.get(url, stream=True, timeout=REQUESTS_TIMEOUT)
-    resp.raise_for_status()
-    total_size = int(resp.headers.get("content-length", 0))
-    size_written = 0
-    chunk_size = 8192
+    use_cache: bool = True,
+) -> Path:
+    """
+    Download the firmware.
 
+    A firmware file, that was already downloaded completely before, is reused if `use_cache` is
+    set. If the server supports range requests, the file is downloaded using multiple connections
+    in parallel. If the firmware file was already downloaded partially (e.g. due to a dropped
+    connection), the download is resumed using a HTTP range request.
+    """
     out_file = dst_dir / (sluggify(f"firmware-{printer_model}-{fw_part}-{latest_version}") + ".djf")
+    checksum_file = out_file.with_name(f"{out_file.name}.sha256")
 
-    with out_file.open("wb") as out:
-        for chunk in resp.iter_content(chunk_size):
-            size_written += out.write(chunk)
-            progress = size_written / total_size * 100
-            print(f"\r{progress: 5.1f} %", end="", flush=True)
+    head = SESSION.head(url, allow_redirects=True, timeout=REQUESTS_TIMEOUT)
+    total_size = int(head.headers.get("content-length", 0)) if head.ok else 0
+
+    if out_file.exists():
+        if use_cache and _is_cached(out_file, checksum_file, total_size):
+            LOGGER.info("Using already downloaded firmware file %s.", out_file)
+
+            return out_file
+
+        if not use_cache or (total_size and out_file.stat().st_size >= total_size):
+            # There is nothing to resume: The download was forced or the file is not partial but
+            # its checksum is unknown (e.g. after an aborted parallel download) or wrong.
+            out_file.unlink()
+
+    checksum_file.unlink(missing_ok=True)
+    resume_from = out_file.stat().st_size if out_file.exists() else 0
+
+    # pwrite is not available on Windows
+    downloaded_in_parallel = (
+        not resume_from and head.ok and pwrite is not None and _download_parallel(head, out_file)
+    )
+
+    if not downloaded_in_parallel:
+        _download_stream(url, out_file, resume_from=resume_from)
+
+    checksum_file.write_text(f"{_sha256sum(out_file)}  {out_file.name}\n")
 
-    print()
     return out_file
 
 
@@ -232,6 +709,7 @@ def get_info_and_download_fw(
     fw_part: FWInfo,
     os: str,
     fw_dir: Path,
+    use_cache: bool = True,
 ) -> typing.Optional[Path]:
     """Try to get the update URL and download the new firmware."""
     LOGGER.info("Try to get information for firmware part %s", fw_part)
@@ -258,6 +736,7 @@ def get_info_and_download_fw(
         printer_model=model,
         fw_part=fw_part,
         latest_version=latest_version,
+        use_cache=use_cache,
     )
 
     return fw_file_path
@@ -269,9 +748,9 @@ def fw_downloader_args(parser: argparse.ArgumentParser) -> None:
         "--os",
         dest="os",
         type=str.upper,
-        default=RUNNING_OS,
+        default=None,
         choices=["WINDOWS", "MAC", "LINUX"],
-        help="Operating system to report when downloading firmware (default: '%(default)s').",
+        help="Operating system to report when downloading firmware (default: the running OS).",
     )
     parser.add_argument(
         "-o",
@@ -281,6 +760,12 @@ def fw_downloader_args(parser: argparse.ArgumentParser) -> None:
         default=".",
         help="Directory, where the firmware will be downloaded (default: '%(default)s').",
     )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Download the firmware again, even if it was already downloaded to --fw-dir.",
+    )
 
 
 def parse_args() -> argparse.Namespace:
@@ -302,6 +787,9 @@ def main() -> None:
 
     CONSOLE_LOG_HANDLER.setLevel(logging.DEBUG if args.debug else logging.INFO)
 
+    if not args.os:
+        args.os = get_running_os()
+
     printer_info = SNMPPrinterInfo.from_args(args)
 
     for fw_part in printer_info.fw_versions:
@@ -310,6 +798,7 @@ def main() -> None:
             fw_part=fw_part,
             os=args.os,
             fw_dir=args.fw_dir,
+            use_cache=args.use_cache,
         )
 
         if fw_file_path:
@@ -1,6 +1,7 @@
 """Upload firmware to the brinter."""
 
 import argparse
+import ipaddress
 import logging
 import socket
 from pathlib import Path
@@ -36,12 +37,23 @@ def upload_fw(
         port,
     )
 
-    addr_info = socket.getaddrinfo(str(target), port, 0, 0, socket.SOL_TCP)[0]
+    try:
+        ip_addr = ipaddress.ip_address(target)
+    except ValueError:
+        # target is a host name
+        family, _type, _proto, _canonname, address = socket.getaddrinfo(
+            str(target), port, 0, 0, socket.SOL_TCP
+        )[0]
+    else:
+        # No need to ask getaddrinfo about an IP address
+        family = socket.AF_INET6 if ip_addr.version == 6 else socket.AF_INET
+        address = (str(ip_addr), port)
 
-    with socket.socket(addr_info[0], addr_info[1], 0) as sock:
-        sock.connect(addr_info[4])
+    with socket.socket(family, socket.SOCK_STREAM, 0) as sock:
+        sock.connect(address)
 
         with fw_file_path.open("rb") as fw_file:
+            # On Linux, this sends the whole file using a single sendfile(2) call, if possible.
             sock.sendfile(fw_file)
 
     LOGGER.success("Successfully uploaded the firmware file %s", fw_file_path)
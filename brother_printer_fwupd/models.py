@@ -10,7 +10,7 @@ import termcolor
 IPAddress = typing.Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
 
 
-@dataclass
+@dataclass(frozen=True)
 class FWInfo:
     """Firmware fragment info."""
 
@@ -55,7 +55,7 @@ class SNMPPrinterInfo:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class MDNSPrinterInfo:
     """Information about a printer received via MDNS."""
 
@@ -4,29 +4,47 @@ import argparse
 import asyncio  # pylint: disable=import-outside-toplevel
 import ipaddress
 import logging
-import re
 import sys
 import typing
 
-from pysnmp.hlapi.v3arch.asyncio import (
-    CommunityData,
-    ContextData,
-    ObjectIdentity,
-    ObjectType,
-    SnmpEngine,
-    Udp6TransportTarget,
-    UdpTransportTarget,
-    bulk_cmd,
-    is_end_of_mib,
-)
-
 from .common import common_args
 from .models import FWInfo, IPAddress, SNMPPrinterInfo
 from .utils import CONSOLE_LOG_HANDLER, DEFAULT_SNMP_PORT, LOGGER, get_default_port
 
 SNMP_ROOT_OID = "1.3.6.1.4.1.2435.2.4.3.99.3.1.6.1.2"
 
-SNMP_RE = re.compile(r'(?P<name>[A-Z]+) ?= ?"(?P<value>.*)"')
+#: Number of OIDs requested per GETBULK request. The agent returns fewer, if the response would
+#: not fit into a single message, so this only limits the number of round trips.
+SNMP_MAX_REPETITIONS = 200
+
+#: Attributes of SNMPPrinterInfo by the name in the SNMP payload
+SNMP_PRINTER_INFO_FIELDS = {
+    "MODEL": "model",
+    "SERIAL": "serial",
+    "SPEC": "spec",
+}
+
+
+def parse_snmp_payload(payload: str) -> typing.Optional[tuple[str, str]]:
+    """
+    Parse a payload like `MODEL="MFC-9332CDW"`.
+
+    :return: A tuple of name and value or None, if the payload is invalid.
+    """
+    name, sep, value = payload.partition("=")
+    name = name.rstrip()
+    value = value.lstrip()
+
+    if (
+        not sep
+        or not (name.isascii() and name.isalpha() and name.isupper())
+        or len(value) < 2
+        or value[0] != '"'
+        or value[-1] != '"'
+    ):
+        return None
+
+    return name, value[1:-1]
 
 
 async def snmp_walk(
@@ -36,6 +54,20 @@ async def snmp_walk(
     root_oid: str = SNMP_ROOT_OID,
 ) -> typing.AsyncGenerator[str, None]:
     """Do a SNMP walk over a MIB given by it's start OID."""
+    # pysnmp takes long to import. Don't let --help or runs without SNMP pay for it.
+    # pylint: disable=import-outside-toplevel
+    from pysnmp.hlapi.v3arch.asyncio import (
+        CommunityData,
+        ContextData,
+        ObjectIdentity,
+        ObjectType,
+        SnmpEngine,
+        Udp6TransportTarget,
+        UdpTransportTarget,
+        bulk_cmd,
+        is_end_of_mib,
+    )
+    from pysnmp.proto.rfc1905 import EndOfMibView
 
     if isinstance(target, str):
         target = ipaddress.ip_address(target)
@@ -53,12 +85,16 @@ async def snmp_walk(
     while True:
         error_indication, error_status, error_index, var_bind_table = await bulk_cmd(
             engine,
-            CommunityData(community, mpModel=0),
+            # SNMPv2c: SNMPv1 has no GETBULK, which would result in one GETNEXT round trip per OID
+            CommunityData(community, mpModel=1),
             udp_target,
             ContextData(),
             0,
-            50,
+            SNMP_MAX_REPETITIONS,
             *var_binds,
+            # The payloads contain the names of the fields, so there is no need to resolve the
+            # received OIDs with MIBs, which is by far the most expensive part of the walk.
+            lookupMib=False,
         )
 
         if error_indication:
@@ -72,22 +108,28 @@ async def snmp_walk(
                 error_status.prettyPrint(),
                 var_binds[int(error_index) - 1][0] if error_index else "?",
             )
-        else:
-            for var_bind in var_bind_table:
-                LOGGER.debug(" = ".join([x.prettyPrint() for x in var_bind]))
-                # TODO this is ugly
-                payload = str(var_bind[1]).strip()
+            sys.exit(1)
 
-                if not payload:
-                    break
+        for var_bind in var_bind_table:
+            LOGGER.debug(" = ".join([x.prettyPrint() for x in var_bind]))
+            oid, value = var_bind
 
-                yield payload
+            if isinstance(value, EndOfMibView) or not str(oid).startswith(f"{root_oid}."):
+                # Left the subtree of root_oid
+                return
 
-        var_binds = var_bind_table
+            # TODO this is ugly
+            payload = str(value).strip()
 
-        if is_end_of_mib(var_binds):
+            if payload:
+                yield payload
+
+        if not var_bind_table:
             break
 
+        # Continue after the last received OID
+        var_binds = [var_bind_table[-1]]
+
 
 async def get_snmp_info(
     target: IPAddress,
@@ -110,22 +152,17 @@ async def get_snmp_info(
     firm_ver: typing.Optional[str] = None
 
     async for payload in snmp_walk(target, community, port, SNMP_ROOT_OID):
-        match = SNMP_RE.match(payload)
+        parsed = parse_snmp_payload(payload)
 
-        if not match:
-            LOGGER.critical('Payload "%s" does not match the regex.', payload)
+        if not parsed:
+            LOGGER.critical('Payload "%s" is invalid.', payload)
 
             continue
             #  sys.exit(1)
-        name = match.group("name")
-        value = match.group("value")
-
-        if name == "MODEL":
-            printer_info.model = value
-        elif name == "SERIAL":
-            printer_info.serial = value
-        elif name == "SPEC":
-            printer_info.spec = value
+        name, value = parsed
+
+        if name in SNMP_PRINTER_INFO_FIELDS:
+            setattr(printer_info, SNMP_PRINTER_INFO_FIELDS[name], value)
         elif name in ("FIRMID", "FIRMVER"):
             if name == "FIRMID":
                 firm_id = value
@@ -2,9 +2,9 @@
 
 # pylint: disable=R1705
 
+import functools
 import io
 import logging
-import os
 import shlex
 import socket
 import string
@@ -16,6 +16,9 @@ from urllib.parse import urlencode
 
 import termcolor
 
+#: Maximum number of stack frames per traceback in issue reports
+TRACEBACK_LIMIT = 50
+
 
 class GitHubIssueReporter:
     """Wrapper around code that helps with reporting issues to GitHub."""
@@ -24,8 +27,12 @@ class GitHubIssueReporter:
         self,
         logger: logging.Logger,
         issue_url: str,
-        handler_cb: typing.Callable[[str], None],
+        handler_cb: typing.Callable[[typing.Callable[[], str]], None],
     ):
+        """
+        :param handler_cb: Called with a function, which generates the URL to report an issue.
+            Generating the URL is deferred, as it requires formatting the traceback.
+        """
         self.logger = logger
         self.issue_url = issue_url
         self.handler_cb = handler_cb
@@ -53,16 +60,19 @@ class GitHubIssueReporter:
         else:
             LOGGER.error(exc)
         self.logger.removeHandler(self._handler)
-        self._handler.stream.seek(0)
-        exc_io = io.StringIO()
-        traceback.print_exception(exc, file=exc_io)
-        exc_io.seek(0)
-        report_url = self._generate_github_issue_url(
-            title=str(exc),
-            log_output=self._handler.stream.read(),
-            exception_traceback=exc_io.read(),
-        )
-        self.handler_cb(report_url)
+
+        def get_report_url() -> str:
+            self._handler.stream.seek(0)
+
+            return self._generate_github_issue_url(
+                title=str(exc),
+                log_output=self._handler.stream.read(),
+                exception_traceback="".join(
+                    traceback.format_exception(exc_class, exc, tb, limit=TRACEBACK_LIMIT)
+                ),
+            )
+
+        self.handler_cb(get_report_url)
         sys.exit(1)
 
     def _generate_github_issue_url(
@@ -139,6 +149,7 @@ class GitHubIssueReporter:
         self._context[key] = value
 
 
+@functools.cache
 def get_running_os() -> (
     typing.Union[typing.Literal["WINDOWS"], typing.Literal["MAC"], typing.Literal["LINUX"]]
 ):
@@ -261,27 +272,33 @@ LOGGER.addHandler(CONSOLE_LOG_HANDLER)
 
 def clear_screen():
     """Clear the terminal screen."""
-    os.system("clear")
-    #  print(chr(27) + '[2j')
-    #  print('\033c')
-    #  print('\x1bc')
+    if sys.stdout.isatty():
+        # Move the cursor home, clear the screen and the scrollback buffer, like clear(1) does.
+        sys.stdout.write("\x1b[H\x1b[2J\x1b[3J")
+        sys.stdout.flush()
+
+
+#: Characters, which are replaced by sluggify
+_SLUGGIFY_TRANS = bytes.maketrans(b" @:", b"_--")
+
+#: Characters, which are removed by sluggify (this includes "/" and ".")
+_SLUGGIFY_DELETE = bytes(
+    char
+    for char in range(256)
+    if chr(char) not in string.ascii_letters + string.digits + "_-" + " @:"
+)
 
 
 def sluggify(value: str) -> str:
     """Convert value to a string that can be safely used as file name."""
-    trans_tab = {
-        " ": "_",
-        "@": "-",
-        ":": "-",
-    }
-    trans = str.maketrans(trans_tab)
-    allowed_chars = string.ascii_letters + string.digits + "".join(trans_tab.values())
-    assert "/" not in allowed_chars
-    assert "." not in allowed_chars
-    value = value.strip().lower().translate(trans)
-    value = "".join(c for c in value if c in allowed_chars)
-
-    return value
+    # Non-ASCII characters are dropped by the encoding, all others are handled in a single pass.
+    return (
+        value.strip()
+        .lower()
+        .encode("ascii", "ignore")
+        .translate(_SLUGGIFY_TRANS, _SLUGGIFY_DELETE)
+        .decode("ascii")
+    )
 
 
 #: The default port for SNMP (UDP)
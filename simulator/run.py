@@ -2,11 +2,19 @@
 
 """Run the printer simulator."""
 
+import asyncio
+import atexit
+import functools
+import os
+import queue
+import selectors
 import socket
 import sys
 import threading
 import time
+import traceback
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from hashlib import sha512
 
 from snmpsim.commands.responder import main as snmpsim_main
@@ -16,21 +24,73 @@ PRINTER_IP = "127.0.0.1"
 PDL_DATASTREAM_PORT = 9100
 SNMP_PORT = 1161
 
-PDL_BUF_SIZE = 1024
+PDL_BUF_SIZE = 64 * 1024
+PDL_LISTEN_BACKLOG = 4096
+
+#: Receive buffers, which are reused across PDL connections. The most recently released buffer is
+#: handed out first, as it is most likely still in the CPU cache. Idle buffers are limited.
+_BUF_POOL: queue.LifoQueue[bytearray] = queue.LifoQueue(maxsize=(os.cpu_count() or 1) * 4)
+
+# The sockets of the PDL Datastream server disable Nagle's algorithm and delayed ACKs, so that the
+# client is not slowed down by waiting for ACKs. When using the simulator on a real NIC, consider
+# also using the fq qdisc (`tc qdisc replace dev <dev> root fq`) and raising the maximum of
+# `net.ipv4.tcp_rmem`, which limits the autotuned receive buffer.
+
+
+def _acquire_buf() -> bytearray:
+    """Get a receive buffer from the pool or allocate a new one if the pool is empty."""
+    try:
+        return _BUF_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(PDL_BUF_SIZE)
+
+
+def _release_buf(buf: bytearray) -> None:
+    """Return a receive buffer to the pool or drop it if the pool is full."""
+    try:
+        _BUF_POOL.put_nowait(buf)
+    except queue.Full:
+        pass
+
+
+def _make_server_socket() -> socket.socket:
+    """Create the non-blocking listening socket of the PDL Datastream server."""
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # SO_RCVBUF is not set on purpose: a fixed buffer size disables the kernel's receive buffer
+    # autotuning, which grows the buffer as needed (up to `net.ipv4.tcp_rmem`).
+
+    if hasattr(socket, "TCP_DEFER_ACCEPT"):
+        # Linux only: Wake up the server only when the client sends data, not already on the SYN.
+        # The value is the timeout in seconds.
+        server_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_DEFER_ACCEPT, 5)
+
+    server_socket.bind((PRINTER_IP, PDL_DATASTREAM_PORT))
+    server_socket.setblocking(False)
+
+    return server_socket
 
 
 class PdlDsStreamServer(threading.Thread):
-    """A single threaded blocking TCP server as a Thread."""
+    """
+    A TCP server as a Thread, which waits for connections using a selector.
+
+    The connections are handled in a thread pool, so that multiple uploads are received in parallel.
+    """
 
     def __init__(self):
-        self._server_socket = socket.create_server(
-            (PRINTER_IP, PDL_DATASTREAM_PORT), reuse_port=True
-        )
+        self._server_socket = _make_server_socket()
+        # Writing to this socket pair wakes up the selector in target() when stopping
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        # The handlers mostly wait for the network, so use the default pool size for I/O bound work
+        self._pool = ThreadPoolExecutor(thread_name_prefix="pdl-ds-connection")
         self._stopping = False
         super().__init__(target=self.target)
 
     def start(self):
-        self._server_socket.listen()
+        self._server_socket.listen(PDL_LISTEN_BACKLOG)
         self._stopping = False
         print(
             f"PDL Datastream server is listening at TCP/IPv4 endpoint {PRINTER_IP}:{PDL_DATASTREAM_PORT}"
@@ -40,44 +100,116 @@ class PdlDsStreamServer(threading.Thread):
     def target(self):
         """Thread function."""
 
-        while True:
-            client_socket, client_info = self._server_socket.accept()
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._server_socket, selectors.EVENT_READ)
+            selector.register(self._wakeup_reader, selectors.EVENT_READ)
+
+            while True:
+                selector.select()
+
+                if self._stopping:
+                    print("Shutting down PDL Datastream server...")
+
+                    return
 
-            if self._stopping:
-                print("Shutting down PDL Datastream server...")
-                client_socket.close()
+                # Drain the accept queue, as several connections may be pending per wakeup
+                while True:
+                    try:
+                        client_socket, client_info = self._server_socket.accept()
+                    except BlockingIOError:
+                        break
 
-                break
-            self.__class__.handle_connection(client_socket, client_info)
+                    client_socket.setblocking(True)
+                    future = self._pool.submit(self.handle_connection, client_socket, client_info)
+                    future.add_done_callback(
+                        functools.partial(self.report_connection_error, client_info)
+                    )
 
     @staticmethod
     def handle_connection(client_socket: socket.socket, client_info: tuple[str, int]) -> None:
         """Handle a client connection."""
-        checksum = sha512()
-        size = 0
-        print(f"Accepted connection from {client_info[0]}:{client_info[1]}")
-        print('"Updating..."')
+        try:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            if hasattr(socket, "TCP_QUICKACK"):
+                # Linux only
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+            checksum = sha512()
+            size = 0
+            print(f"Accepted connection from {client_info[0]}:{client_info[1]}")
+            print('"Updating..."')
+            # Receive into the same buffer again and again instead of allocating a new one per chunk
+            buf = _acquire_buf()
+
+            try:
+                with memoryview(buf) as buf_view:
+                    while True:
+                        chunk_size = client_socket.recv_into(buf)
+
+                        if not chunk_size:
+                            break
+                        checksum.update(buf_view[:chunk_size])
+                        size += chunk_size
+            finally:
+                _release_buf(buf)
+
+            print(f"Received {size} bytes, sha512: {checksum.hexdigest()}")
+        finally:
+            client_socket.close()
 
-        while True:
-            chunk = client_socket.recv(PDL_BUF_SIZE)
-
-            if not chunk:
-                break
-            checksum.update(chunk)
-            size += len(chunk)
-            if len(chunk) < PDL_BUF_SIZE:
-                break
+    @staticmethod
+    def report_connection_error(client_info: tuple[str, int], future: Future) -> None:
+        """Print the error, if handling a client connection failed in the thread pool."""
+        if future.cancelled() or future.exception() is None:
+            return
 
-        print(f"Received {size} bytes, sha512: {checksum.hexdigest()}")
-        client_socket.close()
+        print(
+            f"Handling connection from {client_info[0]}:{client_info[1]} failed:",
+            file=sys.stderr,
+        )
+        traceback.print_exception(future.exception())
 
     def stop(self):
         """Stop the server."""
         self._stopping = True
-        closing_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        closing_socket.connect((PRINTER_IP, PDL_DATASTREAM_PORT))
-        closing_socket.close()
+        self._wakeup_writer.send(b"x")
+        self.join()
+        # Wait for running uploads to finish
+        self._pool.shutdown(wait=True)
         self._server_socket.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+
+#: The Zeroconf instance, which publishes all MDNS entries. Use _get_zeroconf() to access it.
+_ZEROCONF: Zeroconf | None = None
+
+#: The MDNS service type of the PDL Datastream server
+_SERVICE_TYPE = "_pdl-datastream._tcp.local."
+
+#: TXT record properties, which are the same for all published MDNS entries
+_PROP_TEMPLATE = {b"note": b"Printer"}
+
+
+def _get_zeroconf() -> Zeroconf:
+    """Get the shared Zeroconf instance and create it on first use."""
+    global _ZEROCONF  # pylint: disable=global-statement
+
+    if _ZEROCONF is None:
+        _ZEROCONF = Zeroconf(interfaces=InterfaceChoice.All)
+        # Unregister the services and leave the multicast groups when the simulator exits
+        atexit.register(_ZEROCONF.close)
+
+    return _ZEROCONF
+
+
+@functools.cache
+def _encode_ip_address(ip_address: str) -> bytes:
+    """Encode an IPv4 or IPv6 address in packed binary format as required by ServiceInfo."""
+    family = socket.AF_INET6 if ":" in ip_address else socket.AF_INET
+
+    return socket.inet_pton(family, ip_address)
 
 
 def publish_mdns(ip_address: str, name: str) -> None:
@@ -87,47 +219,59 @@ def publish_mdns(ip_address: str, name: str) -> None:
     The entry is published as long as the program runs.
     """
     printer_uuid = uuid.uuid4()
-    zeroconf = Zeroconf(interfaces=InterfaceChoice.All)
-
-    ip_address_encoded = socket.inet_aton(ip_address)
 
     ws_info = ServiceInfo(
-        type_="_pdl-datastream._tcp.local.",
-        name=f"{name}._pdl-datastream._tcp.local.",
+        type_=_SERVICE_TYPE,
+        name=f"{name}.{_SERVICE_TYPE}",
         port=PDL_DATASTREAM_PORT,
         # weight: int = 0,
         # priority: int = 0,
         properties={
+            **_PROP_TEMPLATE,
             b"product": name.encode("utf-8"),
-            b"note": b"Printer",
-            b"UUID": str(printer_uuid).encode("utf-8"),
+            # Wire format: the UUID as 32 lowercase hex digits without dashes. This is shorter than the
+            # 36 characters of the canonical form and, unlike the raw bytes, still valid UTF-8.
+            b"UUID": printer_uuid.hex.encode(),
         },
-        addresses=[ip_address_encoded],
+        addresses=[_encode_ip_address(ip_address)],
         # server: Optional[str] = None,
         # host_ttl: int = 120,
         # other_ttl: int = 4500,
         # *,
-        # addresses: Optional[List[bytes]] = None,
         # parsed_addresses: Optional[List[str]] = None,
         # interface_index: Optional[int] = None,
     )
-    zeroconf.register_service(ws_info)
+    _get_zeroconf().register_service(ws_info)
 
 
 def run_snmpsim() -> None:
     """Run snmpsim as if called from command line."""
+    # snmpsim does not provide an API other than its main function, which parses sys.argv.
     # Arguments for snmpsim-command-responder
     # Same as
     # uv run snmpsim-command-responder --data-dir=./data/ --agent-udpv4-endpoint=127.0.0.1:1024
-    sys.argv.extend(
-        [
-            "--data-dir=./data/",
-            f"--agent-udpv4-endpoint={PRINTER_IP}:{SNMP_PORT}",
-            #  "--log-level=debug",
-            #  "--debug=all",
-        ]
-    )
-    snmpsim_main()
+    try:
+        import uvloop  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        pass
+    else:
+        # snmpsim uses the current event loop, if there is one. uvloop is an optional speedup.
+        asyncio.set_event_loop(uvloop.new_event_loop())
+
+    argv = sys.argv
+    sys.argv = [
+        argv[0],
+        "--data-dir=./data/",
+        f"--agent-udpv4-endpoint={PRINTER_IP}:{SNMP_PORT}",
+        #  "--log-level=debug",
+        #  "--debug=all",
+    ]
+
+    try:
+        snmpsim_main()
+    finally:
+        # Restore the original arguments, so that the simulator can be started again
+        sys.argv = argv
 
 
 def main() -> None:
@@ -14,18 +14,18 @@ from brother_printer_fwupd.autodiscovery import (
 # pylint: disable=protected-access
 
 
-class TestAutodiscovery(unittest.TestCase):
+class TestAutodiscovery(unittest.IsolatedAsyncioTestCase):
     """Test the PrinterDiscoverer class."""
 
-    def test_printer_discoverer(self):
+    async def test_printer_discoverer(self):
         """Test the PrinterDiscoverer class."""
         discoverer = PrinterDiscoverer()
 
         address = ipaddress.IPv4Address("127.0.0.1")
         pdl_ds_port = 8080
 
-        class DummyZeroconf:
-            def get_service_info(self, type_: str, name: str):
+        class DummyAsyncZeroconf:
+            async def async_get_service_info(self, type_: str, name: str, timeout: int):
                 return zeroconf.ServiceInfo(
                     type_,
                     name,
@@ -37,12 +37,20 @@ class TestAutodiscovery(unittest.TestCase):
                     },
                 )
 
-        zc = DummyZeroconf()
+        discoverer._aiozc = DummyAsyncZeroconf()  # type: ignore
         name = f"DUMMY.{ZEROCONF_SERVICE_DOMAIN}"
-        discoverer.add_service(zc, ZEROCONF_SERVICE_DOMAIN, name)
-
-        self.assertEqual(discoverer._printers[0].name, name)
-        self.assertEqual(discoverer._printers[0].ip_addr, address)
-        self.assertEqual(discoverer._printers[0].port, pdl_ds_port)
-        self.assertEqual(discoverer._printers[0].product, "DUMMY")
-        self.assertEqual(discoverer._printers[0].note, "Printer")
+        discoverer.add_service(None, ZEROCONF_SERVICE_DOMAIN, name)  # type: ignore
+        await discoverer._resolve_tasks[name]
+
+        self.assertEqual(discoverer._printers[name][0].name, name)
+        self.assertEqual(discoverer._printers[name][0].ip_addr, address)
+        self.assertEqual(discoverer._printers[name][0].port, pdl_ds_port)
+        self.assertEqual(discoverer._printers[name][0].product, "DUMMY")
+        self.assertEqual(discoverer._printers[name][0].note, "Printer")
+        self.assertIn(name, discoverer._rendered_printers[discoverer._printers[name][0]])
+        self.assertIsNotNone(discoverer._screen_update_handle)
+
+        discoverer.remove_service(None, ZEROCONF_SERVICE_DOMAIN, name)  # type: ignore
+        self.assertEqual(discoverer._printers, {})
+        self.assertEqual(discoverer._rendered_printers, {})
+        discoverer._cancel_screen_update()
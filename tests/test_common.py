@@ -1,3 +1,28 @@
 """Test of the common module."""
 
-# TODO write some tests.
+import argparse
+import contextlib
+import io
+import unittest
+
+from brother_printer_fwupd import __version__
+from brother_printer_fwupd.common import common_args
+
+
+class TestCommon(unittest.TestCase):
+    """Test the common module."""
+
+    def test_version(self):
+        """Test that --version prints the version to stdout."""
+        parser = argparse.ArgumentParser(prog="prog")
+        common_args(parser, ip_required=False)
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as context:
+                parser.parse_args(["--version"])
+
+        self.assertEqual(context.exception.code, 0)
+        self.assertEqual(stdout.getvalue(), f"prog {__version__}\n")
+        self.assertEqual(stderr.getvalue(), "")
@@ -1,3 +1,229 @@
 """Unit tests for firmware_downloader."""
 
-# TODO write some tests.
+import tempfile
+import threading
+import unittest
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from brother_printer_fwupd.firmware_downloader import (
+    DOWNLOAD_CONNECTIONS,
+    _parse_content_range,
+    _parse_content_range_total,
+    download_fw,
+    get_download_url,
+    parse_response,
+)
+from brother_printer_fwupd.models import FWInfo, SNMPPrinterInfo
+
+# pylint: disable=protected-access
+
+FIRMWARE = bytes(range(256)) * 4096 * 4
+
+API_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<RESPONSEINFO>
+  <FIRMUPDATEINFO>
+    <VERSIONCHECK>{versioncheck}</VERSIONCHECK>
+    <FIRMID>MAIN</FIRMID>
+    <LATESTVERSION>R2402011200</LATESTVERSION>
+    <PATH>https://example.com/firmware.djf</PATH>
+  </FIRMUPDATEINFO>
+</RESPONSEINFO>
+"""
+
+
+class FirmwareRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve `FIRMWARE` with support for (single) range requests.
+
+    If `misplaced_ranges` is set on the server, all ranges start at byte 0 like with a broken proxy.
+    """
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        """Handle a HEAD request."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(FIRMWARE)))
+        self.end_headers()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle a GET request."""
+        self.server.get_requests += 1  # type: ignore
+        start, end = 0, len(FIRMWARE) - 1
+        range_header = self.headers.get("Range")
+
+        if range_header:
+            first, _sep, last = range_header.removeprefix("bytes=").partition("-")
+            start = int(first)
+            end = int(last) if last else end
+
+            if self.server.misplaced_ranges:  # type: ignore
+                start = 0
+
+            if start >= len(FIRMWARE):
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(FIRMWARE)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(FIRMWARE)}")
+        else:
+            self.send_response(HTTPStatus.OK)
+
+        body = FIRMWARE[start : end + 1]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Be quiet."""
+
+
+class TestFirmwareDownloader(unittest.TestCase):
+    """Test the firmware_downloader module."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FirmwareRequestHandler)
+        self.server.get_requests = 0  # type: ignore
+        self.server.misplaced_ranges = False  # type: ignore
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/firmware.djf"
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.dst_dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server_thread.join()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def _download(self, use_cache: bool = True) -> Path:
+        return download_fw(
+            url=self.url,
+            dst_dir=self.dst_dir,
+            printer_model="DUMMY",
+            fw_part="MAIN",
+            latest_version="1.0",
+            use_cache=use_cache,
+        )
+
+    def test_parse_content_range_total(self):
+        """Test parsing the complete length from Content-Range headers."""
+        self.assertEqual(_parse_content_range_total("bytes 100-999/1000"), 1000)
+        self.assertEqual(_parse_content_range_total("bytes */1000"), 1000)
+        self.assertIsNone(_parse_content_range_total("bytes 100-999/*"))
+        self.assertIsNone(_parse_content_range_total(None))
+
+    def test_parse_content_range(self):
+        """Test parsing the byte positions from Content-Range headers."""
+        self.assertEqual(_parse_content_range("bytes 100-999/1000"), (100, 999))
+        self.assertEqual(_parse_content_range("bytes 100-999/*"), (100, 999))
+        self.assertIsNone(_parse_content_range("bytes */1000"))
+        self.assertIsNone(_parse_content_range("items 100-999/1000"))
+        self.assertIsNone(_parse_content_range(None))
+
+    def test_parse_response(self):
+        """Test parsing the response of the update API."""
+        self.assertEqual(
+            parse_response(API_RESPONSE.format(versioncheck="0"), firmid="MAIN"),
+            ("R2402011200", "https://example.com/firmware.djf"),
+        )
+        self.assertEqual(
+            parse_response(API_RESPONSE.format(versioncheck="1"), firmid="MAIN"),
+            (None, None),
+        )
+
+        for invalid_response in ("", "<RESPONSEINFO />", API_RESPONSE.format(versioncheck="3")):
+            with self.assertRaises(ValueError):
+                parse_response(invalid_response, firmid="MAIN")
+
+    def test_get_download_url_variant_cache(self):
+        """Test that the API request variant, which worked for a model, is sent first next time."""
+        requests_sent: list[str] = []
+
+        def post_api_request(api_request_data_str: str) -> str:
+            requests_sent.append(api_request_data_str)
+            accepted = "<DRIVER>EWS</DRIVER>" in api_request_data_str
+            return API_RESPONSE.format(versioncheck="0" if accepted else "3")
+
+        printer_info = SNMPPrinterInfo(
+            model="DUMMY", serial="1", spec="0", fw_versions=[FWInfo("MAIN", "1.0")]
+        )
+
+        patch_cache_file = mock.patch(
+            "brother_printer_fwupd.firmware_downloader.VARIANT_CACHE_FILE",
+            self.dst_dir / "variants.json",
+        )
+        patch_post = mock.patch(
+            "brother_printer_fwupd.firmware_downloader._post_api_request",
+            side_effect=post_api_request,
+        )
+
+        with patch_cache_file, patch_post:
+            for expected_requests in (2, 1):
+                requests_sent.clear()
+                self.assertEqual(
+                    get_download_url(printer_info, reported_os="LINUX"),
+                    ("R2402011200", "https://example.com/firmware.djf"),
+                )
+                self.assertEqual(len(requests_sent), expected_requests)
+
+    def test_download_fw(self):
+        """Test downloading a firmware file using parallel connections."""
+        out_file = self._download()
+        self.assertEqual(out_file.read_bytes(), FIRMWARE)
+        self.assertEqual(self.server.get_requests, DOWNLOAD_CONNECTIONS)  # type: ignore
+
+    def test_download_fw_misplaced_ranges(self):
+        """Test falling back to a single connection, if the server returns different ranges."""
+        self.server.misplaced_ranges = True  # type: ignore
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
+
+    def test_download_fw_resume(self):
+        """Test resuming a partial download."""
+        out_file = self._download()
+        out_file.write_bytes(FIRMWARE[:1000])
+        get_requests = self.server.get_requests  # type: ignore
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
+        self.assertEqual(self.server.get_requests, get_requests + 1)  # type: ignore
+
+    def test_download_fw_resume_misplaced_range(self):
+        """Test that a partial download is restarted, if the server returns a different range."""
+        out_file = self._download()
+        out_file.write_bytes(FIRMWARE[:1000])
+        self.server.misplaced_ranges = True  # type: ignore
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
+
+    def test_download_fw_cache(self):
+        """Test that a complete download is reused unless it is corrupted or --no-cache is used."""
+        out_file = self._download()
+        get_requests = self.server.get_requests  # type: ignore
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
+        self.assertEqual(self.server.get_requests, get_requests)  # type: ignore
+
+        self._download(use_cache=False)
+        self.assertGreater(self.server.get_requests, get_requests)  # type: ignore
+
+        out_file.write_bytes(bytes(len(FIRMWARE)))
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
+
+    def test_download_fw_empty_checksum_file(self):
+        """Test that a complete download with an empty checksum file is downloaded again."""
+        out_file = self._download()
+        checksum_file = out_file.with_name(f"{out_file.name}.sha256")
+        checksum_file.write_text("")
+        get_requests = self.server.get_requests  # type: ignore
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
+        self.assertGreater(self.server.get_requests, get_requests)  # type: ignore
+        self.assertTrue(checksum_file.read_text())
+
+    def test_download_fw_invalid_existing_file(self):
+        """Test that an existing file larger than the remote file is replaced."""
+        out_file = self._download()
+        out_file.write_bytes(FIRMWARE + b"garbage")
+        self.assertEqual(self._download().read_bytes(), FIRMWARE)
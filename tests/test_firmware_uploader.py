@@ -1,3 +1,45 @@
 """Unit tests for firmware uploader."""
 
-# TODO write some tests.
+import ipaddress
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from brother_printer_fwupd.firmware_uploader import upload_fw
+
+
+class TestFirmwareUploader(unittest.TestCase):
+    """Test the firmware_uploader module."""
+
+    def test_upload_fw(self):
+        """Test uploading a firmware file to a printer."""
+        firmware = bytes(range(256)) * 1024
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fw_file_path = Path(tmp_dir) / "firmware.djf"
+            fw_file_path.write_bytes(firmware)
+
+            for target in ("127.0.0.1", ipaddress.IPv4Address("127.0.0.1")):
+                with socket.create_server(("127.0.0.1", 0)) as server:
+                    received = bytearray()
+
+                    def receive() -> None:
+                        # pylint: disable=cell-var-from-loop
+                        conn, _addr = server.accept()
+
+                        with conn:
+                            while chunk := conn.recv(65536):
+                                received.extend(chunk)
+
+                    receiver = threading.Thread(target=receive)
+                    receiver.start()
+                    upload_fw(
+                        target=target,  # type: ignore
+                        port=server.getsockname()[1],
+                        fw_file_path=fw_file_path,
+                    )
+                    receiver.join()
+
+                self.assertEqual(received, firmware)
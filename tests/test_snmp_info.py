@@ -4,12 +4,21 @@ import ipaddress
 import unittest
 
 from brother_printer_fwupd.models import FWInfo
-from brother_printer_fwupd.snmp_info import get_snmp_info_sync
+from brother_printer_fwupd.snmp_info import get_snmp_info_sync, parse_snmp_payload
 
 
 class TestSNMPInfo(unittest.TestCase):
     """Test the snmp_info module."""
 
+    def test_parse_snmp_payload(self):
+        """Test the parse_snmp_payload function."""
+        self.assertEqual(parse_snmp_payload('MODEL="MFC-9332CDW"'), ("MODEL", "MFC-9332CDW"))
+        self.assertEqual(parse_snmp_payload('FIRMVER = "1.05"'), ("FIRMVER", "1.05"))
+        self.assertEqual(parse_snmp_payload('NOTE="a=""b"'), ("NOTE", 'a=""b'))
+
+        for invalid_payload in ("", "MODEL", 'MODEL="', "MODEL=MFC", 'model="MFC"', '="MFC"'):
+            self.assertIsNone(parse_snmp_payload(invalid_payload))
+
     def test_get_snmp_info_sync(self):
         """
         Test the get_snmp_info_sync function.